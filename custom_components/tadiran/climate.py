@@ -1,6 +1,8 @@
 """Support for Tadiran AC using broadlink IR."""
 
+import functools
 import logging
+import socket
 
 import broadlink
 from broadlink.exceptions import DeviceOfflineError
@@ -41,7 +43,6 @@ from homeassistant.const import (
 from homeassistant.core import callback
 from homeassistant.helpers import config_validation as cv
 from homeassistant.util import slugify
-from homeassistant.util.temperature import convert as convert_temperature
 
 from .const import CONF_RM_TYPE, CONF_TEMP_ENTITY_ID, CONF_HUMIDITY_ENTITY_ID
 
@@ -50,8 +51,34 @@ _LOGGER = logging.getLogger(__name__)
 MIN_TEMP = 16
 MAX_TEMP = 30
 
+_MIN_TEMP = float(MIN_TEMP)
+_MAX_TEMP = float(MAX_TEMP)
+
 DEFAULT_RM_TYPE = 0x2737
 
+# Socket timeout (seconds) for Broadlink traffic
+_DEVICE_TIMEOUT = 2
+
+_INVALID_STATES = frozenset((STATE_UNAVAILABLE, STATE_UNKNOWN))
+
+_HVAC_ACTION_MAP = {
+    HVAC_MODE_COOL: CURRENT_HVAC_COOL,
+    HVAC_MODE_DRY: CURRENT_HVAC_DRY,
+    HVAC_MODE_FAN_ONLY: CURRENT_HVAC_FAN,
+    HVAC_MODE_HEAT: CURRENT_HVAC_HEAT,
+}
+
+_FAN_MAP = {FAN_AUTO: 0, FAN_LOW: 1, FAN_MEDIUM: 2, FAN_HIGH: 3}
+
+_MODE_MAP = {
+    HVAC_MODE_OFF: 0,
+    HVAC_MODE_FAN_ONLY: 0,  # XXX 0 seems to be auto and not fan
+    HVAC_MODE_COOL: 1,
+    HVAC_MODE_DRY: 2,
+    HVAC_MODE_HEAT_COOL: 3,
+    HVAC_MODE_HEAT: 4,
+}
+
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
     {
         vol.Optional(CONF_NAME, default="tadiran"): cv.string,
@@ -79,15 +106,28 @@ async def create_tadiran_entities(hass, config_entry, async_add_entities):
             )
     ]
 
+    for entity in entities:
+        await hass.async_add_executor_job(entity.remote._connect)
+
     async_add_entities(entities, True)
 
 
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     """Set up Tadiran devices."""
     devices = [
-        TadiranClimate(config[CONF_NAME], config[CONF_IP_ADDRESS], config[CONF_RM_TYPE])
+        TadiranClimate(
+            hass,
+            config[CONF_NAME],
+            config[CONF_IP_ADDRESS],
+            config.get(CONF_RM_TYPE, DEFAULT_RM_TYPE),
+            config.get(CONF_TEMP_ENTITY_ID),
+            config.get(CONF_HUMIDITY_ENTITY_ID),
+        )
     ]
 
+    for device in devices:
+        await hass.async_add_executor_job(device.remote._connect)
+
     async_add_entities(devices)
 
 
@@ -113,35 +153,42 @@ class TadiranClimate(ClimateEntity):
         self._swing_mode = SWING_OFF
         self._temp_entity = temp_entity
         self._humidity_entity = humidity_entity
+        self._temp_cache = (None, None)
+        self._hum_cache = (None, None)
+        self._last_sent_key = None
 
         self.remote = BroadlinkTadiran(ip, rm_type)
 
         self.hass = hass
 
-    def get_entity_val(self, entity):
-        if not entity:
+    def get_entity_val(self, entity, cache_attr):
+        if entity is None:
             return None
 
         sensor_state = self.hass.states.get(entity)
 
-        if sensor_state == None:
+        if sensor_state is None or sensor_state.state in _INVALID_STATES:
             return None
 
-        if sensor_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
-            return None
+        # Only re-parse the state string when the sensor actually updated
+        last_updated, value = getattr(self, cache_attr)
+        if last_updated == sensor_state.last_updated:
+            return value
 
-        return float(sensor_state.state)
+        value = float(sensor_state.state)
+        setattr(self, cache_attr, (sensor_state.last_updated, value))
+        return value
 
     @property
     def current_humidity(self):
         """Return the current humidity."""
-        return self.get_entity_val(self._humidity_entity)
+        return self.get_entity_val(self._humidity_entity, "_hum_cache")
 
 
     @property
     def current_temperature(self):
         """Return the sensor temperature."""
-        return self.get_entity_val(self._temp_entity)
+        return self.get_entity_val(self._temp_entity, "_temp_cache")
 
     @property
     def name(self):
@@ -177,14 +224,7 @@ class TadiranClimate(ClimateEntity):
     @property
     def hvac_action(self):
         """Currently HVAC state"""
-        hvac_action = {
-            HVAC_MODE_COOL: CURRENT_HVAC_COOL,
-            HVAC_MODE_DRY: CURRENT_HVAC_DRY,
-            HVAC_MODE_FAN_ONLY: CURRENT_HVAC_FAN,
-            HVAC_MODE_HEAT: CURRENT_HVAC_HEAT,
-        }.get(self._hvac_mode, CURRENT_HVAC_OFF)
-
-        return hvac_action
+        return _HVAC_ACTION_MAP.get(self._hvac_mode, CURRENT_HVAC_OFF)
 
     @property
     def target_temperature(self):
@@ -218,14 +258,21 @@ class TadiranClimate(ClimateEntity):
 
     def set_temperature(self, **kwargs) -> None:
         temp = kwargs.get(ATTR_TEMPERATURE)
+        if temp is None or temp == self._target_temp:
+            return
         self._target_temp = temp
         self.send_state()
 
     def set_fan_mode(self, fan_mode: str) -> None:
+        if fan_mode == self._fan_mode:
+            return
         self._fan_mode = fan_mode
         self.send_state()
 
     def set_hvac_mode(self, hvac_mode: str) -> None:
+        if hvac_mode == self._hvac_mode:
+            return
+
         if hvac_mode == HVAC_MODE_OFF:
             self._last_hvac_mode = self._hvac_mode
 
@@ -233,38 +280,37 @@ class TadiranClimate(ClimateEntity):
         self.send_state()
 
     def set_swing_mode(self, swing_mode: str) -> None:
+        if swing_mode == self._swing_mode:
+            return
         self._swing_mode = swing_mode
         self.send_state()
 
     def send_state(self):
+        # Skip the IR round-trip when the effective state already went out
+        key = (self._hvac_mode, self._fan_mode, self._swing_mode, self._target_temp)
+        if key == self._last_sent_key:
+            return
+        self._last_sent_key = key
+
         _LOGGER.debug(
             f"Sending new state: {self._hvac_mode} {self._fan_mode} {self._swing_mode} {self._target_temp}"
         )
         args_vars = {
             "temp": int(self._target_temp),
-            "fan": {FAN_AUTO: 0, FAN_LOW: 1, FAN_MEDIUM: 2, FAN_HIGH: 3}.get(
-                self._fan_mode, 0
-            ),
+            "fan": _FAN_MAP.get(self._fan_mode, 0),
             "swing": 1 if self._swing_mode != SWING_OFF else 0,
             "on": 1 if self._hvac_mode != HVAC_MODE_OFF else 0,
-            "mode": {
-                HVAC_MODE_OFF: 0,
-                HVAC_MODE_FAN_ONLY: 0,  # XXX 0 seems to be auto and not fan
-                HVAC_MODE_COOL: 1,
-                HVAC_MODE_DRY: 2,
-                HVAC_MODE_HEAT_COOL: 3,
-                HVAC_MODE_HEAT: 4,
-            }.get(self._hvac_mode, 1),
+            "mode": _MODE_MAP.get(self._hvac_mode, 1),
         }
         self.remote.send(args_vars)
 
     @property
     def min_temp(self) -> float:
-        return convert_temperature(MIN_TEMP, TEMP_CELSIUS, self.temperature_unit)
+        return _MIN_TEMP
 
     @property
     def max_temp(self) -> float:
-        return convert_temperature(MAX_TEMP, TEMP_CELSIUS, self.temperature_unit)
+        return _MAX_TEMP
 
     @property
     def unique_id(self):
@@ -282,49 +328,89 @@ class TadiranClimate(ClimateEntity):
 PREFIX = "26004e0000012793"
 SUFFIX = "14000d0500000000000000000000"
 
-unpack = [
-    {"name": "unknown2", "shift": 27, "bits": 8, "default": 0x4A},
-    {"name": "blow", "shift": 23, "bits": 1, "default": 0},
-    {"name": "light", "shift": 21, "bits": 1, "default": 1},
-    {"name": "turbo", "shift": 20, "bits": 1, "default": 0},
-    {"name": "temp", "shift": 8, "bits": 4, "default": 20},
-    {"name": "swing", "shift": 6, "bits": 2, "default": 0},
-    {"name": "fan", "shift": 4, "bits": 2, "default": 1},
-    {"name": "on", "shift": 3, "bits": 1, "default": 1},
-    {"name": "mode", "shift": 0, "bits": 3, "default": 1},
-]
-
+_PREFIX_BYTES = bytes.fromhex(PREFIX)
+_SUFFIX_BYTES = bytes.fromhex(SUFFIX)
 
-def pack(vals):
-    bits = list("0" * (35))
+# The two pulse/space byte pairs a single code bit can produce
+_BIT0 = b"\x16\x13"
+_BIT1 = b"\x16\x37"
+_TWO = (_BIT0, _BIT1)
 
-    for descr in unpack:
-        start = descr["shift"]
+# Every 5-bit slice of the code expands to one of 32 10-byte fragments,
+# so the 35-bit body is 7 table lookups instead of 35 bit tests.
+_NIBBLE5 = tuple(
+    b"".join(_TWO[(n >> i) & 1] for i in range(5)) for n in range(32)
+)
 
-        i = vals.get(descr["name"], descr["default"])
-        v = ("{0:0%d" % descr["bits"] + "b}").format(i)[::-1]
+# Optional native fast path: with numba installed the body fill compiles
+# to machine code (cached on disk across restarts); otherwise pack()
+# falls back to the pure-Python loop below.
+try:
+    import numpy as np
+    from numba import njit
+
+    @njit(cache=True)
+    def _pack_body(code, out):
+        for i in range(35):
+            out[2 * i] = 0x16
+            out[2 * i + 1] = 55 if (code >> i) & 1 else 19
+
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
+
+# (name, shift, mask, default) for every field of the 35-bit code
+_FIELDS = (
+    ("unknown2", 27, 0xFF, 0x4A),
+    ("blow", 23, 0x1, 0),
+    ("light", 21, 0x1, 1),
+    ("turbo", 20, 0x1, 0),
+    ("temp", 8, 0xF, 20),
+    ("swing", 6, 0x3, 0),
+    ("fan", 4, 0x3, 1),
+    ("on", 3, 0x1, 1),
+    ("mode", 0, 0x7, 1),
+)
 
-        for i in range(descr["bits"]):
-            bits[start + i] = v[i]
 
-    data = bytearray.fromhex(PREFIX)
-    for x in bits:
-        data.append(0x16)
-        data.append(19 if x == "0" else 55)
+@functools.lru_cache(maxsize=512)
+def pack(vals_tuple):
+    """Build the IR frame for a tuple of field values in _FIELDS order."""
+    code = 0
+    for (_, shift, mask, _), val in zip(_FIELDS, vals_tuple):
+        code |= (val & mask) << shift
 
-    data = data + bytearray.fromhex(SUFFIX)
+    if _HAVE_NUMBA:
+        out = np.empty(35 * 2, dtype=np.uint8)
+        _pack_body(code, out)
+        body = out.tobytes()
+    else:
+        body = b"".join(_NIBBLE5[(code >> (5 * j)) & 0x1F] for j in range(7))
 
-    return data
+    return _PREFIX_BYTES + body + _SUFFIX_BYTES
 
 
 class BroadlinkTadiran:
+    __slots__ = ("_ip", "_rmtype", "dev", "_available")
+
     def __init__(self, ip, rmtype):
+        self._ip = ip
+        self._rmtype = rmtype
+        self.dev = None
+        self._available = False
+
+    def _connect(self):
+        """Discover and authenticate the device; blocking, run in executor."""
         mac = "000000000000"
         try:
-            self.dev = broadlink.gendevice(rmtype, (ip, 80), mac)
+            self.dev = broadlink.gendevice(self._rmtype, (self._ip, 80), mac)
         except broadlink.exceptions.DeviceOfflineError:
             raise CannotConnect
 
+        # Fail fast instead of hanging the executor thread for >10s when
+        # the device is offline
+        self.dev.timeout = _DEVICE_TIMEOUT
+
         try:
             self._available = self.dev.auth()
         except broadlink.exceptions.DeviceOfflineError:
@@ -335,31 +421,23 @@ class BroadlinkTadiran:
         return self._available
 
     def send(self, args_vars):
-        data = {}
-
-        for k in unpack:
-            arg = k["name"]
-            val = args_vars.get(arg, None)
-            if val != None:
-                data[arg] = val
-
         if args_vars.get("on") == 0:
             _LOGGER.info("Turning OFF the AC")
 
-        bytes = pack(data)
-        self.dev.send_data(bytes)
+        vals = tuple(
+            args_vars.get(name, default) for name, _, _, default in _FIELDS
+        )
+        self.dev.send_data(pack(vals))
 
     def is_alive(self):
-        # XXX XXX XXX should set timeout - if not connected will hang for more
-        # than 10 seconds
-        _LOGGER.warning("testing connectivity")
+        _LOGGER.debug("testing connectivity")
         try:
             self.dev.send_packet(0x6A, bytes())
-        except DeviceOfflineError:
+        except (DeviceOfflineError, socket.timeout):
             _LOGGER.warning("Failed to connect to Broadlink device")
             return False
 
-        _LOGGER.warning("connectivity OK")
+        _LOGGER.debug("connectivity OK")
         return True
 
 
@@ -27,6 +27,7 @@ DATA_SCHEMA = vol.Schema(
 
 def tadiran_validate(ip, rm_type):
     dev = BroadlinkTadiran(ip, rm_type)
+    dev._connect()
     if not dev.available:
         raise CannotConnect
 